@@ -3,13 +3,16 @@ from flask_cors import CORS
 import pandas as pd
 import numpy as np
 import joblib
+import xgboost as xgb
 import os
+import threading
 from datetime import datetime, timedelta
 from flask_pymongo import PyMongo
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, verify_jwt_in_request
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
+from drift_monitor import DriftMonitor
 
 load_dotenv() # Load variables from .env if present
 
@@ -31,6 +34,24 @@ model = None
 le_city = None
 le_season = None
 weather_data = None
+drift_monitor = None
+
+# Cached candidate features, predictions and explanations per (location, day).
+prediction_cache = {}
+prediction_cache_lock = threading.Lock()
+prediction_key_locks = {}
+
+FEATURE_COLUMNS = ["city", "month", "season", "avg_temp", "max_temp", "avg_humidity", "rainfall"]
+
+# Farmer-facing groups for the per-feature contributions returned by explain mode.
+CONTRIBUTION_GROUPS = {
+    "temperature": ["avg_temp", "max_temp"],
+    "humidity": ["avg_humidity"],
+    "rainfall": ["rainfall"],
+    "season": ["season"],
+    "harvest_month": ["month"],
+    "city": ["city"],
+}
 
 def get_season(m):
     if m in [3,4,5]: return "Summer"
@@ -52,7 +73,7 @@ def load_weather(file_path, city_name):
     return df[["date","month", "day", "T2M","RH2M","PRECTOTCORR","city"]]
 
 def init_app():
-    global model, le_city, le_season, weather_data
+    global model, le_city, le_season, weather_data, drift_monitor
     
     # Load Model & Encoders
     try:
@@ -63,6 +84,17 @@ def init_app():
     except Exception as e:
         print(f"Error loading model/encoders: {e}")
         
+    # Load reference statistics saved by build_drift_reference.py for drift monitoring
+    reference_path = os.path.join(BASE_DIR, "drift_reference.joblib")
+    if os.path.exists(reference_path):
+        try:
+            drift_monitor = DriftMonitor(joblib.load(reference_path))
+            print("Drift reference loaded.")
+        except Exception as e:
+            print(f"Error loading drift reference: {e}")
+    else:
+        print("Warning: No drift reference found. Run build_drift_reference.py to enable drift monitoring.")
+        
     # Load Weather for historical averages
     dfs = []
     weather_files = {
@@ -171,71 +203,153 @@ def history():
         })
     return jsonify(data)
 
-@app.route('/recommend', methods=['POST'])
-def recommend():
-    if not model:
-        return jsonify({"error": "Model not loaded. Please train model first."}), 500
-        
-    data = request.json
-    location = data.get('location')
-    
-    if location not in ["Bengaluru", "Ramanagara", "Shidlaghatta", "Siddlaghatta"]:
-        return jsonify({"error": "Invalid location"}), 400
-        
-    results = []
-    today = datetime.now().date()
-    
+def build_candidates(location, today):
     # Updated to wider range range(-2, 12) to ensure we catch Colab's optimal date
     # even if there are timezone differences.
-    for i in range(-2, 12):
-        start_date = today + timedelta(days=i)
+    start_dates = [today + timedelta(days=i) for i in range(-2, 12)]
+    return build_features(location, start_dates)
+
+def encode_city(location):
+    # Model expects 'Ramanagar' instead of 'Ramanagara'
+    model_location = location
+    if location == "Ramanagara":
+        model_location = "Ramanagar"
+    return le_city.transform([model_location])[0]
+
+def build_features(location, start_dates):
+    city_code = encode_city(location)
+
+    dates = []
+    rows = []
+    for start_date in start_dates:
         weather_stats = get_historical_weather(location, start_date)
         if not weather_stats:
             continue
-            
-        try:
-            # Model expects 'Ramanagar' instead of 'Ramanagara'
-            model_location = location
-            if location == "Ramanagara":
-                model_location = "Ramanagar"
-            
-            city_code = le_city.transform([model_location])[0]
-            season_str = get_season(start_date.month)
-            season_code = le_season.transform([season_str])[0]
-        except Exception as e:
-            return jsonify({"error": f"Encoding error: {str(e)}"}), 500
-            
+
+        season_str = get_season(start_date.month)
+        season_code = le_season.transform([season_str])[0]
         harvest_date = start_date + timedelta(days=25) # Updated to 25 days cycle
-        
-        # DEBUG: print(f"Features: City={location}, Month={harvest_date.month} (Harvest), Season={season_str}")
 
         # Fix: Model expects 'city', 'month', 'season' features
         # CRITICAL FIX: Colab uses 'harvest_month' (end_date.month) for the 'month' feature!
-        features = pd.DataFrame([{
-            "city": city_code,   
+        rows.append({
+            "city": city_code,
             "month": harvest_date.month, # Matches Colab logic (Harvest Month)
-            "season": season_code, 
+            "season": season_code,
             "avg_temp": weather_stats["avg_temp"],
             "max_temp": weather_stats["max_temp"],
             "avg_humidity": weather_stats["avg_humidity"],
             "rainfall": weather_stats["rainfall"]
-        }])
-        
-        # Ensure correct column order: city, month, season, ...
-        features = features[["city", "month", "season", "avg_temp", "max_temp", "avg_humidity", "rainfall"]]
-        
-        print(f"DEBUG PREDICTING FOR {location} on {start_date}:")
-        print(features.to_string())
-        
-        predicted_price = model.predict(features)[0]
-        
+        })
+        dates.append((start_date, harvest_date))
+
+    # Ensure correct column order: city, month, season, ...
+    features = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    return dates, features
+
+def explain_predictions(features):
+    # One batched exact TreeSHAP call over all candidate rows. The last column is the bias term.
+    # This costs tens of ms on the 600-tree model, so it runs once per cache fill, not per request.
+    contribs = model.get_booster().predict(xgb.DMatrix(features), pred_contribs=True)
+    columns = list(features.columns)
+
+    grouped = {
+        group: contribs[:, [columns.index(c) for c in cols]].sum(axis=1)
+        for group, cols in CONTRIBUTION_GROUPS.items()
+    }
+    grouped["base_value"] = contribs[:, -1]
+
+    return [
+        {group: float(values[i]) for group, values in grouped.items()}
+        for i in range(len(features))
+    ]
+
+def predict_candidates(location, today):
+    dates, features = build_candidates(location, today)
+    if features.empty:
+        return None
+
+    print(f"DEBUG PREDICTING FOR {location} from {today}:")
+    print(features.to_string())
+
+    prices = model.predict(features)
+    results = []
+    for (start_date, harvest_date), predicted_price in zip(dates, prices):
         print(f"  -> Candidate: {start_date} | Price: {predicted_price}")
-        
         results.append({
             "start_date": start_date.strftime("%Y-%m-%d"),
             "harvest_date": harvest_date.strftime("%Y-%m-%d"),
             "predicted_price": float(predicted_price)
         })
+    return {
+        "features": features,
+        "prices": prices,
+        "results": results,
+        "contributions": explain_predictions(features)
+    }
+
+def get_predictions(location, explain=False):
+    global prediction_cache
+    today = datetime.now().date()
+    key = (location, today)
+
+    # Hits read the cache without locking; it is only ever swapped out whole, never mutated.
+    # Misses take a per-key lock so concurrent requests for the same key compute it once,
+    # without blocking hits or misses for other locations.
+    entry = prediction_cache.get(key)
+    if entry is None:
+        with prediction_cache_lock:
+            key_lock = prediction_key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = prediction_cache.get(key)
+            if entry is None:
+                entry = predict_candidates(location, today)
+                if entry is None:
+                    return None
+
+                # Historical averages only depend on the calendar day, so drop stale days.
+                with prediction_cache_lock:
+                    cache = {k: v for k, v in prediction_cache.items() if k[1] == today}
+                    cache[key] = entry
+                    prediction_cache = cache
+                    for stale in [k for k in prediction_key_locks if k[1] != today]:
+                        del prediction_key_locks[stale]
+
+    # Record every served row, not just cache misses, so the summaries follow traffic.
+    if drift_monitor:
+        drift_monitor.record(location, entry["features"], entry["prices"])
+
+    results = [dict(r) for r in entry["results"]]
+    if explain:
+        for r, c in zip(results, entry["contributions"]):
+            r["contributions"] = c
+    return results
+
+@app.route('/metrics/drift', methods=['GET'])
+def drift_metrics():
+    if not drift_monitor:
+        return jsonify({"error": "Drift monitoring not enabled. Run build_drift_reference.py to create drift_reference.joblib."}), 503
+    return jsonify(drift_monitor.scores())
+
+@app.route('/recommend', methods=['POST'])
+def recommend():
+    if not model:
+        return jsonify({"error": "Model not loaded. Please train model first."}), 500
+        
+    data = request.json
+    location = data.get('location')
+    explain = str(data.get('explain', request.args.get('explain', ''))).lower() in ["true", "1"]
+    
+    if location not in ["Bengaluru", "Ramanagara", "Shidlaghatta", "Siddlaghatta"]:
+        return jsonify({"error": "Invalid location"}), 400
+        
+    try:
+        results = get_predictions(location, explain)
+    except Exception as e:
+        return jsonify({"error": f"Prediction error: {str(e)}"}), 500
+
+    if not results:
+        return jsonify({"error": "No weather data available for this location"}), 500
         
     results.sort(key=lambda x: x["predicted_price"], reverse=True)
     best_rec = results[0]
@@ -0,0 +1,32 @@
+import time
+import app as backend
+
+RUNS = 50
+
+def time_ms(fn):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn()
+    return (time.perf_counter() - start) / RUNS * 1000
+
+def benchmark(location="Bengaluru"):
+    backend.init_app()
+    dates, features = backend.build_candidates(location, backend.datetime.now().date())
+    print(f"Candidates per request: {len(features)}")
+
+    predict_ms = time_ms(lambda: backend.model.predict(features))
+    explain_ms = time_ms(lambda: backend.explain_predictions(features))
+
+    # Cached path: predictions and contributions are computed once per location per day.
+    backend.get_predictions(location)
+    plain_ms = time_ms(lambda: backend.get_predictions(location))
+    cached_ms = time_ms(lambda: backend.get_predictions(location, explain=True))
+
+    print(f"Batched predict:            {predict_ms:.3f} ms")
+    print(f"Exact pred_contribs:        {explain_ms:.3f} ms (once per cache fill)")
+    print(f"Cached plain response:      {plain_ms:.3f} ms")
+    print(f"Cached explain response:    {cached_ms:.3f} ms")
+    print(f"Explain overhead (cached):  {cached_ms - plain_ms:.3f} ms")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,63 @@
+import os
+import joblib
+import pandas as pd
+from datetime import timedelta
+import app as backend
+from drift_monitor import build_reference
+
+# Rearing cycle length, matching build_features() and get_historical_weather().
+WINDOW_DAYS = 25
+
+def training_windows(city, city_df):
+    """One row per single-year 25-day window, with the app's feature construction.
+
+    This is the population the model was trained on. Serving replaces each window
+    with multi-year averages for the same calendar days.
+    """
+    w = city_df.sort_values("date").reset_index(drop=True)
+    # Rolling values end at row i + 24; shift back so row i holds the window starting at i.
+    shift = -(WINDOW_DAYS - 1)
+    frame = pd.DataFrame({
+        "start_date": w["date"],
+        "avg_temp": w["T2M"].rolling(WINDOW_DAYS).mean().shift(shift),
+        "max_temp": w["T2M"].rolling(WINDOW_DAYS).max().shift(shift),
+        "avg_humidity": w["RH2M"].rolling(WINDOW_DAYS).mean().shift(shift),
+        "rainfall": w["PRECTOTCORR"].rolling(WINDOW_DAYS).sum().shift(shift)
+    })
+    # Drop windows that run off the end of the data or span gaps.
+    contiguous = (w["date"].shift(shift) - w["date"]).dt.days == WINDOW_DAYS - 1
+    frame = frame[contiguous].reset_index(drop=True)
+
+    harvest_dates = frame["start_date"] + timedelta(days=WINDOW_DAYS)
+    frame["city"] = backend.encode_city(city)
+    frame["month"] = harvest_dates.dt.month
+    frame["season"] = backend.le_season.transform(frame["start_date"].dt.month.map(backend.get_season))
+    return frame
+
+def build():
+    """Reference statistics for drift monitoring, built from the served model.
+
+    Uses the app's feature construction and city names on the training-window
+    population, and prices from the shipped model. Does not touch model.pkl or
+    the encoders.
+    """
+    backend.init_app()
+    if backend.model is None or backend.weather_data is None:
+        raise RuntimeError("Model or weather data not loaded.")
+
+    frames = []
+    for city, city_df in backend.weather_data.groupby("city"):
+        print(f"Building training windows for {city}...")
+        windows = training_windows(city, city_df)
+        frame = windows[["month", "avg_temp", "avg_humidity", "rainfall"]].copy()
+        frame["predicted_price"] = backend.model.predict(windows[backend.FEATURE_COLUMNS])
+        frame["city"] = city
+        frames.append(frame)
+
+    data = pd.concat(frames, ignore_index=True)
+    reference = build_reference(data)
+    joblib.dump(reference, os.path.join(backend.BASE_DIR, "drift_reference.joblib"))
+    print(f"Drift reference saved to drift_reference.joblib ({len(data)} windows, {len(reference)} city/month keys)")
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,150 @@
+import threading
+import time
+import numpy as np
+
+# Features tracked for drift, plus the model output itself.
+DRIFT_FEATURES = ["avg_temp", "avg_humidity", "rainfall", "predicted_price"]
+N_BINS = 10
+# Scores cover the current window plus the previous one, so old traffic ages out.
+WINDOW_SECONDS = 24 * 60 * 60
+EPSILON = 1e-4
+
+def histogram(values, edges):
+    # Fixed bins: (-inf, e0), [e0, e1), ..., [en, inf)
+    bins = np.searchsorted(edges, np.asarray(values, dtype=float), side="right")
+    return np.bincount(bins, minlength=len(edges) + 1)
+
+def build_reference(frame, n_bins=N_BINS):
+    """Reference histograms keyed by (city, harvest month).
+
+    `frame` needs "city" and "month" (harvest month) columns plus every column in
+    DRIFT_FEATURES, one row per training window. Each key gets its own quantile
+    bin edges, since serving traffic only ever covers harvest months near today.
+    """
+    reference = {}
+    for (city, month), group in frame.groupby(["city", "month"]):
+        edges = {}
+        counts = {}
+        for feature in DRIFT_FEATURES:
+            quantiles = np.quantile(group[feature], np.linspace(0, 1, n_bins + 1))[1:-1]
+            edges[feature] = np.unique(quantiles).tolist()
+            counts[feature] = histogram(group[feature], edges[feature]).tolist()
+        reference[(city, int(month))] = {"edges": edges, "counts": counts}
+    return reference
+
+def psi(expected, actual):
+    e = np.maximum(expected / max(expected.sum(), 1), EPSILON)
+    a = np.maximum(actual / max(actual.sum(), 1), EPSILON)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+def ks(expected, actual):
+    # KS statistic on the binned CDFs (a lower bound on the exact KS distance).
+    e = np.cumsum(expected) / max(expected.sum(), 1)
+    a = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(a - e)))
+
+class DriftMonitor:
+    """Streaming histograms of model inputs and predictions per (city, harvest month).
+
+    Live rows are compared against the distribution the model was trained on:
+    single-year 25-day weather windows with the same harvest month. Serving uses
+    multi-year averages, which are smoother than any single year, so some PSI/KS
+    is expected even when nothing is wrong. That baseline is the train/serve skew;
+    watch for changes relative to it rather than absolute thresholds.
+
+    Counts live in two rotating windows of `window_seconds` each, so scores reflect
+    the last one to two windows of traffic rather than the process lifetime.
+    Memory is fixed (one small count array per key and feature) and each
+    record() call does its bin lookups outside the lock, then a short add under it.
+    """
+
+    def __init__(self, reference, window_seconds=WINDOW_SECONDS):
+        self.reference = {
+            key: {
+                "edges": {f: np.asarray(e, dtype=float) for f, e in ref["edges"].items()},
+                "counts": {f: np.asarray(c, dtype=float) for f, c in ref["counts"].items()}
+            }
+            for key, ref in reference.items()
+        }
+        self.window_seconds = window_seconds
+        self._window_start = time.monotonic()
+        self._current = self._empty_window()
+        self._previous = self._empty_window()
+        self._lock = threading.Lock()
+
+    def _empty_window(self):
+        return {"counts": {}, "unreferenced": {}}
+
+    def _rotate(self):
+        # Called with the lock held.
+        elapsed = time.monotonic() - self._window_start
+        if elapsed < self.window_seconds:
+            return
+        self._previous = self._current if elapsed < 2 * self.window_seconds else self._empty_window()
+        self._current = self._empty_window()
+        self._window_start = time.monotonic()
+
+    def record(self, city, features, predictions):
+        months = features["month"].to_numpy()
+        values = {
+            "avg_temp": features["avg_temp"].to_numpy(),
+            "avg_humidity": features["avg_humidity"].to_numpy(),
+            "rainfall": features["rainfall"].to_numpy(),
+            "predicted_price": np.asarray(predictions)
+        }
+
+        # Each row is binned under its own harvest month.
+        updates = []
+        unreferenced = 0
+        for month in np.unique(months):
+            mask = months == month
+            ref = self.reference.get((city, int(month)))
+            if ref is None:
+                unreferenced += int(mask.sum())
+                continue
+            bins = {f: histogram(values[f][mask], ref["edges"][f]) for f in DRIFT_FEATURES}
+            updates.append(((city, int(month)), bins))
+
+        with self._lock:
+            self._rotate()
+            window = self._current
+            for key, bins in updates:
+                counts = window["counts"].get(key)
+                if counts is None:
+                    window["counts"][key] = bins
+                else:
+                    for f in DRIFT_FEATURES:
+                        counts[f] += bins[f]
+            if unreferenced:
+                window["unreferenced"][city] = window["unreferenced"].get(city, 0) + unreferenced
+
+    def scores(self):
+        live = {}
+        unreferenced = {}
+        with self._lock:
+            self._rotate()
+            for window in (self._previous, self._current):
+                for key, feats in window["counts"].items():
+                    if key not in live:
+                        live[key] = {f: c.copy() for f, c in feats.items()}
+                    else:
+                        for f in DRIFT_FEATURES:
+                            live[key][f] += feats[f]
+                for city, count in window["unreferenced"].items():
+                    unreferenced[city] = unreferenced.get(city, 0) + count
+
+        report = {}
+        for (city, month), feats in live.items():
+            ref = self.reference[(city, month)]["counts"]
+            city_report = report.setdefault(city, {"unreferenced_rows": 0, "months": {}})
+            city_report["months"][str(month)] = {
+                "count": int(feats[DRIFT_FEATURES[0]].sum()),
+                "reference_count": int(ref[DRIFT_FEATURES[0]].sum()),
+                "features": {
+                    f: {"psi": psi(ref[f], feats[f]), "ks": ks(ref[f], feats[f])}
+                    for f in DRIFT_FEATURES
+                }
+            }
+        for city, count in unreferenced.items():
+            report.setdefault(city, {"unreferenced_rows": 0, "months": {}})["unreferenced_rows"] = count
+        return report
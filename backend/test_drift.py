@@ -0,0 +1,32 @@
+import requests
+import json
+import sys
+
+BASE_URL = "http://localhost:5000"
+
+def test_drift():
+    # 1. Make a Recommendation so the monitor has something recorded
+    print("Requesting recommendation...")
+    resp = requests.post(f"{BASE_URL}/recommend", json={"location": "Bengaluru"})
+    if resp.status_code != 200:
+        print(f"Recommendation Failed: {resp.text}")
+        sys.exit(1)
+        
+    # 2. Fetch Drift Metrics
+    print("Fetching drift metrics...")
+    resp = requests.get(f"{BASE_URL}/metrics/drift")
+    if resp.status_code == 200:
+        data = resp.json()
+        print(f"Cities monitored: {list(data.keys())}")
+        for city, report in data.items():
+            if report["unreferenced_rows"]:
+                print(f"  {city}: {report['unreferenced_rows']} rows without reference")
+            for month, month_report in report["months"].items():
+                for feature, scores in month_report["features"].items():
+                    print(f"  {city} / month {month} / {feature}: PSI={scores['psi']:.3f} KS={scores['ks']:.3f} (n={month_report['count']}, ref n={month_report['reference_count']})")
+    else:
+        print(f"Drift Metrics Failed: {resp.status_code} - {resp.text}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    test_drift()
@@ -0,0 +1,37 @@
+import requests
+import json
+import sys
+
+def test_explain():
+    url = "http://localhost:5000/recommend"
+    payload = {"location": "Bengaluru", "explain": True}
+    try:
+        response = requests.post(url, json=payload)
+        response.raise_for_status()
+        data = response.json()
+        print("Success!")
+        print(f"Recommended Start: {data.get('recommended_date')}")
+        print(f"Predicted Price: {data.get('predicted_price')}")
+        
+        # Contributions plus base value should add back up to the predicted price
+        for pred in data.get('all_predictions'):
+            contribs = pred.get('contributions')
+            if not contribs:
+                print(f"Missing contributions for {pred['start_date']}")
+                sys.exit(1)
+            total = sum(contribs.values())
+            if abs(total - pred['predicted_price']) > 0.01:
+                print(f"Contributions do not sum to price for {pred['start_date']}: {total} vs {pred['predicted_price']}")
+                sys.exit(1)
+        
+        print(f"Best Date Contributions: {json.dumps(data.get('all_predictions')[0]['contributions'], indent=2)}")
+        
+    except Exception as e:
+        print(f"Error: {e}")
+        if 'response' in locals():
+            print("Status Code:", response.status_code)
+            print("Response Content:", response.text)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    test_explain()